@@ -7,13 +7,15 @@ Calculates risk scores (0-1000) for cryptocurrency wallets based on transaction
 import os
 import time
 import json
-import requests
+import asyncio
+import aiohttp
+import diskcache
+import orjson
 import numpy as np
+from numba import njit, prange
 import pandas as pd
 from tqdm import tqdm
-from web3 import Web3
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 from dotenv import load_dotenv
 import matplotlib.pyplot as plt 
 
@@ -25,166 +27,464 @@ class Config:
     INFURA_URL = f"https://mainnet.infura.io/v3/{os.getenv('INFURA_API_KEY')}"
     ETHERSCAN_API_KEY = os.getenv('ETHERSCAN_API_KEY')
     INPUT_CSV = "data/Wallet_id.csv"
-    OUTPUT_CSV = "data/wallet_risk_scores.csv"
-    MAX_WORKERS = 10  # Number of parallel threads
-    REQUEST_DELAY = 0.1  # Delay between API calls (seconds)
+    OUTPUT_PARQUET = "data/wallet_risk_scores.parquet"
+    PARQUET_ROW_GROUP_SIZE = 1000  # Rows written per Parquet row group
+    CACHE_DIR = "data/.etherscan_cache"  # Persistent API response cache
+    BALANCE_TTL = 60  # Seconds to reuse a cached ETH balance
+    BALANCE_BATCH_SIZE = 100  # eth_getBalance calls per JSON-RPC batch
+    PAGE_SIZE = 1000  # Transactions per Etherscan page
+    MAX_RESULT_WINDOW = 10000  # Etherscan returns at most page * offset rows
+    MAX_RESPONSE_BYTES = 50_000_000  # Abort responses larger than this
+    READ_CHUNK_SIZE = 65536  # Bytes per streamed read
+    RATE_LIMIT = 5  # Etherscan allows 5 calls/second
+    MAX_WORKERS = 50  # Wallets processed concurrently on the event loop
+    CONNECTION_LIMIT = 100  # Max open HTTP connections
+    DNS_CACHE_TTL = 300  # Seconds to reuse resolved API hostnames
     MAX_RETRIES = 3  # Max retries for API calls
     TIMEOUT = 15  # API timeout in seconds
 
-# Predefined DeFi contracts for faster lookup
-DEFI_CONTRACTS = {
+# Predefined DeFi contracts for faster lookup (lowercase, as Etherscan returns them)
+DEFI_CONTRACTS = frozenset({
     '0x7d2768de32b0b80b7a3454c06bdac94a69ddc7a9',  # Aave
     '0x3d9819210a31b4961b30ef54be2aed79b9c9cd3b',  # Compound
     '0xd9e1ce17f2641f24ae83637ab66a2cca9c378b9f',  # SushiSwap
     '0x7a250d5630b4cf539739df2c5dacb4c659f2488d',  # Uniswap
     '0x1111111254fb6c44bac0bed2854e76f90643097d'   # 1inch
+})
+
+# Same contracts as Categorical categories; any other address gets code -1
+DEFI_CATEGORIES = sorted(DEFI_CONTRACTS)
+
+# Balances arrive in wei; int / int division keeps full float precision
+WEI_PER_ETH = 10 ** 18
+
+# Raw features consumed by the scoring model, in column order
+FEATURE_COLUMNS = [
+    'tx_count',
+    'defi_interactions',
+    'account_age_days',
+    'tx_frequency',
+    'balance_eth'
+]
+
+# Below this many transactions a Categorical costs more than it saves
+MIN_VECTORIZED_TXS = 32
+
+# Transaction fields kept after parsing, with their column dtypes
+TX_FIELDS = {
+    'to': 'U42',
+    'timeStamp': np.int64,
+    'blockNumber': np.int64
 }
 
-# Initialize Web3
-w3 = Web3(Web3.HTTPProvider(Config.INFURA_URL))
+# One wallet's transactions for one action, as parallel NumPy columns
+Transactions = Dict[str, np.ndarray]
+
+# HTTP statuses worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Transaction history and balances persisted across runs
+cache = diskcache.Cache(Config.CACHE_DIR)
+
+class RateLimiter:
+    """Spaces requests to a rate-limited API at least 1/rate seconds apart"""
+    
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self.next_slot = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait for the next free slot, then claim it"""
+        async with self.lock:
+            now = time.monotonic()
+            if self.next_slot > now:
+                await asyncio.sleep(self.next_slot - now)
+            self.next_slot = max(now, self.next_slot) + self.interval
+
+async def read_limited(response: aiohttp.ClientResponse) -> Optional[bytes]:
+    """Read a response body in chunks, giving up once it exceeds MAX_RESPONSE_BYTES"""
+    if (response.content_length or 0) > Config.MAX_RESPONSE_BYTES:
+        return None
+    
+    chunks = []
+    size = 0
+    async for chunk in response.content.iter_chunked(Config.READ_CHUNK_SIZE):
+        size += len(chunk)
+        if size > Config.MAX_RESPONSE_BYTES:
+            return None
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+def project_transactions(rows: List[Dict]) -> Transactions:
+    """Keep only the fields scoring needs, as NumPy columns"""
+    n = len(rows)
+    return {
+        'to': np.fromiter((row.get('to') or '' for row in rows), dtype='U42', count=n),
+        'timeStamp': np.fromiter((int(row['timeStamp']) for row in rows), dtype=np.int64, count=n),
+        'blockNumber': np.fromiter((int(row['blockNumber']) for row in rows), dtype=np.int64, count=n)
+    }
+
+def concat_transactions(parts: List[Transactions]) -> Transactions:
+    """Join transaction columns fetched in several pieces"""
+    return {
+        field: np.concatenate([txs[field] for txs in parts]) if parts else np.empty(0, dtype)
+        for field, dtype in TX_FIELDS.items()
+    }
 
-def fetch_transaction_data(wallet_address: str, action: str) -> List[Dict]:
-    """Fetch transaction data from Etherscan with retry logic"""
+async def fetch_transaction_page(
+    session: aiohttp.ClientSession,
+    rate_limiter: RateLimiter,
+    wallet_address: str,
+    action: str,
+    start_block: int,
+    page: int
+) -> Optional[Transactions]:
+    """Fetch one page of transactions from Etherscan with retry logic (None on failure)"""
     url = (
         f"https://api.etherscan.io/api?module=account&action={action}&"
-        f"address={wallet_address}&startblock=0&endblock=99999999&"
+        f"address={wallet_address}&startblock={start_block}&endblock=99999999&"
+        f"page={page}&offset={Config.PAGE_SIZE}&"
         f"sort=asc&apikey={Config.ETHERSCAN_API_KEY}"
     )
     
     for attempt in range(Config.MAX_RETRIES):
         try:
-            response = requests.get(url, timeout=Config.TIMEOUT)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('status') == '1':
-                    return data['result']
-            time.sleep(Config.REQUEST_DELAY)
-        except requests.exceptions.RequestException:
-            time.sleep(1)
-    
-    return []
-
-def fetch_wallet_data(wallet_address: str) -> Tuple[List[Dict], List[Dict]]:
-    """Fetch all transaction data for a wallet in parallel"""
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        native_txs = executor.submit(
-            fetch_transaction_data,
-            wallet_address,
-            'txlist'
-        )
-        erc20_txs = executor.submit(
-            fetch_transaction_data,
+            await rate_limiter.acquire()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    body = await read_limited(response)
+                    if body is None:
+                        return None  # Oversized payload, retrying won't help
+                    data = orjson.loads(body)
+                    if data.get('status') == '1':
+                        return project_transactions(data['result'])
+                    if data.get('result') == []:
+                        return concat_transactions([])  # No (more) transactions
+                    # Any other status '0' reply is an API error (rate limit,
+                    # timeout, bad key): retry, and give up with None below
+                elif response.status not in RETRY_STATUSES:
+                    return None
+        except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError):
+            pass
+        await asyncio.sleep(0.2 * 2 ** attempt)
+    
+    return None
+
+def drop_last_block(txs: Transactions) -> Tuple[Transactions, int]:
+    """Remove the (possibly partially fetched) last block from txs and return its number"""
+    last_block = txs['blockNumber'][-1]
+    keep = np.searchsorted(txs['blockNumber'], last_block)
+    return {field: column[:keep] for field, column in txs.items()}, int(last_block)
+
+async def fetch_new_transactions(
+    session: aiohttp.ClientSession,
+    rate_limiter: RateLimiter,
+    wallet_address: str,
+    action: str,
+    start_block: int
+) -> Optional[Transactions]:
+    """Fetch transactions from start_block onwards, one page at a time (None on failure)"""
+    pages = []
+    page = 1
+    
+    while True:
+        txs = await fetch_transaction_page(
+            session,
+            rate_limiter,
             wallet_address,
-            'tokentx'
+            action,
+            start_block,
+            page
         )
-        return native_txs.result(), erc20_txs.result()
+        if txs is None:
+            # Keep only whole blocks so the next run resumes cleanly
+            fetched = concat_transactions(pages)
+            if len(fetched['blockNumber']):
+                fetched, _ = drop_last_block(fetched)
+            if not len(fetched['blockNumber']):
+                return None  # Nothing usable was fetched
+            return fetched
+        
+        pages.append(txs)
+        if len(txs['blockNumber']) < Config.PAGE_SIZE:
+            return concat_transactions(pages)
+        
+        page += 1
+        if (page - 1) * Config.PAGE_SIZE >= Config.MAX_RESULT_WINDOW:
+            # Etherscan caps page * offset, so restart the window at the last
+            # block seen, refetching it whole in case it was split across pages
+            fetched = concat_transactions(pages)
+            if fetched['blockNumber'][-1] == start_block:
+                return fetched  # A single block fills the window; cannot advance
+            fetched, start_block = drop_last_block(fetched)
+            pages = [fetched]
+            page = 1
 
-def calculate_wallet_features(wallet_address: str) -> Dict:
-    """Calculate all features for a single wallet"""
-    native_txs, erc20_txs = fetch_wallet_data(wallet_address)
-    all_txs = native_txs + erc20_txs
+async def fetch_transaction_data(
+    session: aiohttp.ClientSession,
+    rate_limiter: RateLimiter,
+    wallet_address: str,
+    action: str
+) -> Transactions:
+    """Fetch full transaction history, downloading only blocks not yet cached"""
+    key = ('txs', wallet_address, action)
+    cached_txs = cache.get(key) or concat_transactions([])
+    blocks = cached_txs['blockNumber']
+    start_block = int(blocks[-1]) + 1 if len(blocks) else 0
     
-    # Basic metrics
-    tx_count = len(all_txs)
-    defi_interactions = sum(
-        1 for tx in all_txs 
-        if tx.get('to', '').lower() in DEFI_CONTRACTS
+    new_txs = await fetch_new_transactions(
+        session,
+        rate_limiter,
+        wallet_address,
+        action,
+        start_block
     )
+    if new_txs is None:
+        if not len(blocks):
+            raise RuntimeError(f"Could not fetch {action} history")
+        return cached_txs  # Update failed; the cached history is still valid
+    if not len(new_txs['blockNumber']):
+        return cached_txs
     
-    # Timing metrics
-    if tx_count > 0:
-        first_tx = int(all_txs[0]['timeStamp'])
-        last_tx = int(all_txs[-1]['timeStamp'])
-        age_days = (last_tx - first_tx) / 86400
-        tx_freq = tx_count / age_days if age_days > 0 else 0
-    else:
-        age_days = 0
-        tx_freq = 0
-    
-    # ETH balance
-    try:
-        balance = w3.eth.get_balance(Web3.to_checksum_address(wallet_address))
-    except:
-        balance = 0
+    all_txs = concat_transactions([cached_txs, new_txs])
+    cache.set(key, all_txs)
+    return all_txs
+
+async def fetch_wallet_data(
+    session: aiohttp.ClientSession,
+    rate_limiter: RateLimiter,
+    wallet_address: str
+) -> Tuple[Transactions, Transactions]:
+    """Fetch native and ERC20 transactions for a wallet concurrently"""
+    native_txs, erc20_txs = await asyncio.gather(
+        fetch_transaction_data(session, rate_limiter, wallet_address, 'txlist'),
+        fetch_transaction_data(session, rate_limiter, wallet_address, 'tokentx')
+    )
+    return native_txs, erc20_txs
+
+async def fetch_balance_batch(
+    session: aiohttp.ClientSession,
+    wallets: List[str]
+) -> Dict[str, int]:
+    """Fetch ETH balances (in wei) for a batch of wallets with retry logic (missing on failure)"""
+    balances = {}
+    pending = wallets
     
-    return {
-        'wallet_id': wallet_address,
-        'tx_count': tx_count,
-        'defi_interactions': defi_interactions,
-        'account_age_days': age_days,
-        'tx_frequency': tx_freq,
-        'balance_eth': float(Web3.from_wei(balance, 'ether')),
-        'is_active': int(tx_count > 0)
-    }
+    for attempt in range(Config.MAX_RETRIES):
+        batch = [
+            {
+                "jsonrpc": "2.0",
+                "id": i,
+                "method": "eth_getBalance",
+                "params": [wallet, "latest"]  # Lowercase hex is valid JSON-RPC input
+            }
+            for i, wallet in enumerate(pending)
+        ]
+        
+        try:
+            async with session.post(Config.INFURA_URL, json=batch) as response:
+                if response.status == 200:
+                    replies = orjson.loads(await response.read())
+                    # A non-list reply means the whole batch was rejected: retry it
+                    if isinstance(replies, list):
+                        for reply in replies:
+                            if 'result' in reply:
+                                balances[pending[reply['id']]] = int(reply['result'], 16)
+                        pending = [wallet for wallet in pending if wallet not in balances]
+                        if not pending:
+                            return balances
+                elif response.status not in RETRY_STATUSES:
+                    return balances
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            pass
+        await asyncio.sleep(0.2 * 2 ** attempt)
+    
+    return balances
 
-def normalize_features(features: Dict) -> Dict:
-    """Normalize features to 0-1 scale"""
+async def fetch_balances(
+    session: aiohttp.ClientSession,
+    wallet_ids: List[str]
+) -> Dict[str, int]:
+    """Fetch ETH balances (in wei) for all wallets, batching uncached ones"""
+    balances = {}
+    for wallet in wallet_ids:
+        balance = cache.get(('balance', wallet))
+        if balance is not None:
+            balances[wallet] = balance
+    
+    # One batch at a time so the provider isn't hit with every chunk at once
+    missing = [wallet for wallet in wallet_ids if wallet not in balances]
+    for i in range(0, len(missing), Config.BALANCE_BATCH_SIZE):
+        batch = await fetch_balance_batch(session, missing[i:i + Config.BALANCE_BATCH_SIZE])
+        for wallet, balance in batch.items():
+            balances[wallet] = balance
+            cache.set(('balance', wallet), balance, expire=Config.BALANCE_TTL)
+    
+    return balances
+
+def count_defi_interactions(to_addresses: np.ndarray) -> int:
+    """Count transactions sent to known DeFi contracts"""
+    if len(to_addresses) >= MIN_VECTORIZED_TXS:
+        codes = pd.Categorical(to_addresses, categories=DEFI_CATEGORIES).codes
+        return int(np.count_nonzero(codes != -1))
+    return sum(1 for address in to_addresses.tolist() if address in DEFI_CONTRACTS)
+
+def allocate_feature_columns(wallet_ids: List[str]) -> Dict[str, np.ndarray]:
+    """Preallocate one array per output column, indexed by wallet position"""
+    n = len(wallet_ids)
     return {
-        'tx_volume': min(np.log1p(features['tx_count']) / 6, 1),
-        'defi_usage': min(features['defi_interactions'] / 15, 1),
-        'account_age': 1 - min(features['account_age_days'] / 730, 1),  # 2 year max
-        'tx_freq': min(features['tx_frequency'] / 10, 1),
-        'balance_risk': 1 - (min(features['balance_eth'], 10) / 10)
+        'wallet_id': np.array(wallet_ids, dtype=object),
+        'tx_count': np.zeros(n, np.int64),
+        'defi_interactions': np.zeros(n, np.int64),
+        'account_age_days': np.zeros(n, np.float64),
+        'tx_frequency': np.zeros(n, np.float64),
+        'balance_eth': np.zeros(n, np.float64),
+        'is_active': np.zeros(n, np.int8)
     }
 
-def calculate_risk_score(normalized: Dict) -> int:
-    """Calculate final risk score (0-1000)"""
-    if not normalized.get('is_active', 1):
-        return 0  # Inactive wallet
+def calculate_wallet_features(
+    columns: Dict[str, np.ndarray],
+    i: int,
+    native_txs: Transactions,
+    erc20_txs: Transactions
+) -> None:
+    """Write transaction features for wallet i into columns (balance is added later)"""
+    histories = [
+        txs['timeStamp']
+        for txs in (native_txs, erc20_txs) if len(txs['timeStamp'])
+    ]
+    if not histories:
+        return  # Columns are zero-initialized, i.e. inactive
     
-    behavior_score = (
-        0.6 * normalized['defi_usage'] +
-        0.4 * normalized['balance_risk']
+    # Basic metrics
+    tx_count = sum(len(timestamps) for timestamps in histories)
+    defi_interactions = (
+        count_defi_interactions(native_txs['to']) +
+        count_defi_interactions(erc20_txs['to'])
     )
     
-    activity_score = (
-        0.4 * normalized['tx_volume'] +
-        0.3 * normalized['tx_freq'] +
-        0.3 * normalized['account_age']
-    )
+    # Timing metrics (each history is sorted ascending by Etherscan)
+    first_tx = min(int(timestamps[0]) for timestamps in histories)
+    last_tx = max(int(timestamps[-1]) for timestamps in histories)
+    age_days = (last_tx - first_tx) / 86400
+    tx_freq = tx_count / age_days if age_days > 0 else 0
     
-    risk_score = (0.6 * behavior_score + 0.4 * activity_score)
-    return int(min(max(risk_score * 1000, 0), 1000))
+    columns['tx_count'][i] = tx_count
+    columns['defi_interactions'][i] = defi_interactions
+    columns['account_age_days'][i] = age_days
+    columns['tx_frequency'][i] = tx_freq
+    columns['is_active'][i] = 1
 
-def process_wallet(wallet_address: str) -> Dict:
-    """Process a single wallet and return score"""
+@njit(parallel=True, cache=True)
+def score_features(features: np.ndarray) -> np.ndarray:
+    """Score an (N, 5) matrix of FEATURE_COLUMNS, compiled to native code"""
+    scores = np.empty(features.shape[0], np.int64)
+    
+    for i in prange(features.shape[0]):
+        # Normalize features to 0-1 scale
+        tx_volume = min(np.log1p(features[i, 0]) / 6, 1.0)
+        defi_usage = min(features[i, 1] / 15, 1.0)
+        account_age = 1 - min(features[i, 2] / 730, 1.0)  # 2 year max
+        tx_freq = min(features[i, 3] / 10, 1.0)
+        balance_risk = 1 - (min(features[i, 4], 10.0) / 10)
+        
+        behavior_score = (
+            0.6 * defi_usage +
+            0.4 * balance_risk
+        )
+        
+        activity_score = (
+            0.4 * tx_volume +
+            0.3 * tx_freq +
+            0.3 * account_age
+        )
+        
+        risk_score = (0.6 * behavior_score + 0.4 * activity_score)
+        scores[i] = int(min(max(risk_score * 1000, 0.0), 1000.0))
+    
+    return scores
+
+def calculate_risk_scores(df: pd.DataFrame) -> np.ndarray:
+    """Calculate final risk scores (0-1000) for all wallets at once"""
+    features = df[FEATURE_COLUMNS].to_numpy(np.float64)
+    scores = score_features(np.ascontiguousarray(features))
+    if 'error' in df:
+        scores[df['error'].notna().to_numpy()] = 0  # Failed wallets score 0
+    return scores
+
+async def process_wallet(
+    session: aiohttp.ClientSession,
+    rate_limiter: RateLimiter,
+    workers: asyncio.Semaphore,
+    columns: Dict[str, np.ndarray],
+    errors: Dict[int, str],
+    i: int
+) -> None:
+    """Fetch wallet i's data and write its raw features into columns"""
+    wallet_address = columns['wallet_id'][i]
     try:
-        features = calculate_wallet_features(wallet_address)
-        normalized = normalize_features(features)
-        score = calculate_risk_score(normalized)
-        return {
-            'wallet_id': wallet_address,
-            'score': score,
-            **features  # Include raw features for debugging
-        }
+        async with workers:
+            native_txs, erc20_txs = await fetch_wallet_data(
+                session,
+                rate_limiter,
+                wallet_address
+            )
+            calculate_wallet_features(columns, i, native_txs, erc20_txs)
     except Exception as e:
         print(f"\nError processing {wallet_address}: {str(e)}")
-        return {
-            'wallet_id': wallet_address,
-            'score': 0,
-            'error': str(e)
-        }
+        errors[i] = str(e)
 
-def process_wallets_parallel(wallet_ids: List[str]) -> pd.DataFrame:
-    """Process all wallets in parallel"""
-    results = []
-    
-    with ThreadPoolExecutor(max_workers=Config.MAX_WORKERS) as executor:
-        futures = {
-            executor.submit(process_wallet, wallet): wallet 
-            for wallet in wallet_ids
-        }
+async def gather_all(
+    wallet_ids: List[str]
+) -> Tuple[Dict[str, np.ndarray], Dict[int, str]]:
+    """Fetch all wallets on a single event loop into preallocated columns"""
+    columns = allocate_feature_columns(wallet_ids)
+    errors = {}
+    rate_limiter = RateLimiter(Config.RATE_LIMIT)
+    workers = asyncio.Semaphore(Config.MAX_WORKERS)
+    connector = aiohttp.TCPConnector(
+        limit=Config.CONNECTION_LIMIT,
+        ttl_dns_cache=Config.DNS_CACHE_TTL
+    )
+    timeout = aiohttp.ClientTimeout(total=Config.TIMEOUT)
+    
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        tasks = [
+            process_wallet(session, rate_limiter, workers, columns, errors, i)
+            for i in range(len(wallet_ids))
+        ]
         
-        for future in tqdm(
-            as_completed(futures), 
+        for task in tqdm(
+            asyncio.as_completed(tasks), 
             total=len(wallet_ids),
             desc="Processing Wallets",
             unit="wallet"
         ):
-            results.append(future.result())
-            time.sleep(Config.REQUEST_DELAY)
+            await task
+        
+        # Inactive wallets skip the balance lookup entirely
+        active = np.flatnonzero(columns['is_active'])
+        wallets = columns['wallet_id'][active]
+        balances = await fetch_balances(session, wallets.tolist())
+        columns['balance_eth'][active] = [
+            balances.get(wallet, 0) / WEI_PER_ETH for wallet in wallets
+        ]
+        for i, wallet in zip(active, wallets):
+            if wallet not in balances:
+                print(f"\nError processing {wallet}: ETH balance unavailable")
+                errors[int(i)] = "ETH balance unavailable"
     
-    return pd.DataFrame(results)
+    return columns, errors
+
+def process_wallets_parallel(wallet_ids: List[str]) -> pd.DataFrame:
+    """Process all wallets concurrently and score them in one pass"""
+    columns, errors = asyncio.run(gather_all(wallet_ids))
+    df = pd.DataFrame(columns, copy=False)
+    if errors:
+        df['error'] = pd.Series(errors, dtype=object)
+    df.insert(1, 'score', calculate_risk_scores(df))
+    return df
 
 def analyze_results(df: pd.DataFrame):
     """Analyze and display score distribution"""
@@ -218,13 +518,12 @@ def main():
         print("=" * 40)
         
         # Load wallet data
-        wallets_df = pd.read_csv(Config.INPUT_CSV)
         wallet_ids = (
-            wallets_df['wallet_id']
-            .astype(str)
+            pd.read_csv(Config.INPUT_CSV, usecols=['wallet_id'], dtype='string')['wallet_id']
             .str.strip()
             .str.lower()
-            .unique()
+            .dropna()
+            .drop_duplicates()
             .tolist()
         )
         print(f"\nLoaded {len(wallet_ids)} wallet addresses")
@@ -242,8 +541,12 @@ def main():
         save_sample_results(risk_scores)
         
         # Save full results
-        risk_scores.to_csv(Config.OUTPUT_CSV, index=False)
-        print(f"\nSaved full results to {Config.OUTPUT_CSV}")
+        risk_scores.to_parquet(
+            Config.OUTPUT_PARQUET,
+            index=False,
+            row_group_size=Config.PARQUET_ROW_GROUP_SIZE
+        )
+        print(f"\nSaved full results to {Config.OUTPUT_PARQUET}")
         
     except Exception as e:
         print(f"\nError in main execution: {str(e)}")